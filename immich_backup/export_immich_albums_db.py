@@ -1,15 +1,32 @@
+import contextlib
+import errno
+import functools
 import os
+import queue
+import re
+import select
 import shutil
 import psycopg2
+import psycopg2.pool
 import json
 import traceback
-import urllib.request, urllib.error
+import http.client
+import urllib.parse
 import time
 import logging
 import signal
+import sqlite3
+import stat
+import threading
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
 # Enhanced logging setup
 logging.basicConfig(
     level=logging.INFO,
@@ -22,19 +39,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Enhanced signal handling for pause/resume
+# The handler only flips flags: it runs on the main thread between bytecodes,
+# possibly while that thread holds a lock, so it must not take one itself
+# (logging included); the copy loop logs the change when it notices it
 pause_requested = False
 shutdown_requested = False
 
 def signal_handler(signum, frame):
     global pause_requested, shutdown_requested
     if signum == signal.SIGUSR1:
-        logger.info("Pause requested")
         pause_requested = True
     elif signum == signal.SIGUSR2:
-        logger.info("Resume requested")
         pause_requested = False
     elif signum in (signal.SIGTERM, signal.SIGINT):
-        logger.info("Shutdown requested")
         shutdown_requested = True
 
 signal.signal(signal.SIGUSR1, signal_handler)
@@ -42,6 +59,26 @@ signal.signal(signal.SIGUSR2, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 signal.signal(signal.SIGINT, signal_handler)
 
+# Every signal also writes a byte here (from C, before the handler runs), so
+# a paused copy loop can sleep in select() and wake for the next one
+_signal_r, _signal_w = os.pipe()
+os.set_blocking(_signal_r, False)
+os.set_blocking(_signal_w, False)
+signal.set_wakeup_fd(_signal_w, warn_on_full_buffer=False)
+
+def wait_while_paused():
+    """Block until resumed (SIGUSR2) or asked to shut down (SIGTERM/SIGINT)"""
+    while True:
+        try:
+            while os.read(_signal_r, 512):  # drop wakeups already handled
+                pass
+        except BlockingIOError:
+            pass
+        # a signal after this check leaves a byte in the pipe, so select() can't miss it
+        if not pause_requested or shutdown_requested:
+            return
+        select.select([_signal_r], [], [])
+
 # -------- Your original helpers (unchanged) --------
 def _env_str(name, default=""):
     s = os.environ.get(name)
@@ -76,6 +113,7 @@ def _pct(n, d):
 
 EXPORT_DIR    = _env_str("EXPORT_DIR", "/mnt/album_export")
 PROGRESS_FILE = os.path.join(EXPORT_DIR, "progress.json")
+MANIFEST_FILE = os.path.join(EXPORT_DIR, "manifest.sqlite")
 DB_HOST       = _env_str("DB_HOST", "localhost")
 DB_PORT       = _env_int("DB_PORT", 5432)
 DB_NAME       = _env_str("DB_NAME", "immich")
@@ -83,6 +121,7 @@ DB_USER       = _env_str("DB_USER", "postgres")
 DB_PASS       = _env_str("DB_PASS", "password")
 USER_ID       = _env_str("IMMICH_USER_ID", "")
 ASSETS_ROOT   = _env_str("ASSETS_ROOT", "")
+DB_WORK_MEM   = _env_str("DB_WORK_MEM", "64MB")  # per-session; keeps the export join's hashes in memory
 
 # Deletion guard thresholds
 MIN_FOUND_ABS       = _env_int("MIN_FOUND_ABS", 100)
@@ -92,7 +131,14 @@ MIN_FOUND_FRACTION  = _env_float("MIN_FOUND_FRACTION", 0.05)
 HA_PUSH_INTERVAL_SEC = _env_int("HA_PUSH_INTERVAL_SEC", 60)
 
 # Enhanced: Performance options
-PARALLEL_COPIES = _env_int("PARALLEL_COPIES", 1)  # Default to 1 to maintain compatibility
+DELETE_WORKERS = max(1, _env_int("DELETE_WORKERS", 8))  # cleanup unlink threads
+SCAN_WORKERS = max(1, _env_int("SCAN_WORKERS", 8))  # directory walk threads; 1 = serial
+PROGRESS_WRITE_INTERVAL_SEC = 2.0  # min seconds between the flusher's progress.json rewrites
+# Rename alone keeps readers consistent; fsync only if the file must survive power loss
+PROGRESS_FSYNC = _env_str("PROGRESS_FSYNC", "false").lower() == "true"
+# Walk ASSETS_ROOT once up front instead of stat()ing candidate paths per asset
+INDEX_ASSETS_ROOT = _env_str("INDEX_ASSETS_ROOT", "true").lower() != "false"
+PARALLEL_COPIES = max(1, _env_int("PARALLEL_COPIES", 4))  # Copy worker threads; 1 = serial
 INTEGRITY_CHECK = os.environ.get("SKIP_INTEGRITY_CHECK", "false").lower() != "true"
 
 # Home Assistant Supervisor API 
@@ -116,126 +162,185 @@ progress = {
     "can_resume": False,
     "last_run": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 }
+# Guards `progress`; readers copy it under the lock and work from the copy
+_progress_lock = threading.Lock()
 
 # ---------- Enhanced HA helper ----------
-def ha_post_state(entity_id: str, state, attributes: dict | None = None):
-    """Enhanced with better error handling and retries"""
+# One keep-alive connection to the supervisor, reused across pushes
+_HA_URL = urllib.parse.urlsplit(HA_API_BASE)
+_ha_conn = None
+# supervisor/core restarting; anything else (401, 400, ...) won't fix itself on retry
+_HA_RETRY_STATUS = frozenset({502, 503, 504})
+
+class _HAStatusError(http.client.HTTPException):
+    def __init__(self, status, reason):
+        super().__init__(f"HTTP {status} {reason}")
+        self.status = status
+
+def _ha_request(path: str, body: bytes):
+    """POST body to HA_API_BASE + path over the shared connection"""
+    global _ha_conn
+    if _ha_conn is None:
+        _ha_conn = http.client.HTTPConnection(_HA_URL.netloc, timeout=5)
+    try:
+        _ha_conn.request("POST", _HA_URL.path + path, body,
+                         {"Authorization": f"Bearer {HA_TOKEN}",
+                          "Content-Type": "application/json",
+                          "Connection": "keep-alive"})
+        resp = _ha_conn.getresponse()
+        resp.read()  # drain so the connection can be reused
+    except Exception:
+        # drop the socket; the next call reconnects
+        _ha_conn.close()
+        _ha_conn = None
+        raise
+    if resp.status >= 400:
+        raise _HAStatusError(resp.status, resp.reason)
+
+def ha_post_state(entity_id: str, state, attributes: dict | None = None) -> bool:
+    """Enhanced with better error handling and retries; True once HA accepted the state"""
     if not HA_TOKEN:
-        return
+        return False
     
+    payload = {"state": str(state), "attributes": attributes or {}}
+    body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
     max_retries = 2
     for attempt in range(max_retries):
         try:
-            url = f"{HA_API_BASE}/states/{entity_id}"
-            body = json.dumps({"state": str(state), "attributes": attributes or {}}).encode()
-            req = urllib.request.Request(
-                url, data=body, method="POST",
-                headers={"Authorization": f"Bearer {HA_TOKEN}",
-                         "Content-Type": "application/json"}
-            )
-            urllib.request.urlopen(req, timeout=5).read()
-            return
+            _ha_request(f"/states/{entity_id}", body)
+            return True
         except Exception as e:
-            if attempt < max_retries - 1:
+            retryable = not isinstance(e, _HAStatusError) or e.status in _HA_RETRY_STATUS
+            if retryable and attempt < max_retries - 1:
                 time.sleep(1)
             else:
-                logger.debug(f"HA state push failed for {entity_id}: {e}")
+                logger.debug("HA state push failed for %s: %s", entity_id, e)
+                return False
+
+def _ha_snapshot(p: dict | None = None):
+    """Values behind each HA sensor, keyed by progress field"""
+    if p is None:
+        with _progress_lock:
+            p = dict(progress)
+    # Overall % done = (copied + skipped + failed) / total
+    total = p.get("total", 0) or 0
+    processed = (p.get("copied", 0) or 0) + (p.get("skipped", 0) or 0) + (p.get("failed", 0) or 0)
+    return {
+        "status": p.get("status", "unknown"),
+        "copied": p.get("copied", 0),
+        "skipped": p.get("skipped", 0),
+        "failed": p.get("failed", 0),
+        "deleted": p.get("deleted", 0),
+        "total": total,
+        "last_run": p.get("last_run", ""),
+        "paused": p.get("paused", False),
+        "files_per_second": p.get("files_per_second", 0),
+        "percent": _pct(processed, total),
+        "guard": p.get("guard", "") or "",
+        "error": p.get("error", "") or "",
+    }
 
-def push_progress_to_ha():
-    """Enhanced with additional sensors"""
-    attrs = {"friendly_name": "Immich Backup", "icon": "mdi:cloud-sync"}
-    
-    # Your original sensors
-    ha_post_state("sensor.immich_backup_status",
-                  progress.get("status", "unknown"), {**attrs})
-
-    ha_post_state("binary_sensor.immich_backup_running",
-                  "on" if progress.get("status") == "running" else "off",
-                  {"friendly_name": "Immich Backup Running"})
-
-    ha_post_state("sensor.immich_backup_copied",
-                  progress.get("copied", 0),
-                  {**attrs, "unit_of_measurement": "files", "icon": "mdi:file-upload"})
-    ha_post_state("sensor.immich_backup_skipped",
-                  progress.get("skipped", 0),
-                  {**attrs, "unit_of_measurement": "files", "icon": "mdi:file-cancel-outline"})
-    ha_post_state("sensor.immich_backup_failed",
-                  progress.get("failed", 0),
-                  {**attrs, "unit_of_measurement": "files", "icon": "mdi:alert-circle"})
-    ha_post_state("sensor.immich_backup_deleted",
-                  progress.get("deleted", 0),
-                  {**attrs, "unit_of_measurement": "files", "icon": "mdi:trash-can-outline"})
-    ha_post_state("sensor.immich_backup_total",
-                  progress.get("total", 0),
-                  {**attrs, "unit_of_measurement": "files", "icon": "mdi:counter"})
-    ha_post_state("sensor.immich_backup_last_run",
-                  progress.get("last_run", ""),
-                  {**attrs, "icon": "mdi:clock-outline"})
+_HA_ATTRS = {"friendly_name": "Immich Backup", "icon": "mdi:cloud-sync"}
 
-    # Enhanced: Additional sensors
-    ha_post_state("binary_sensor.immich_backup_paused",
-                  "on" if progress.get("paused", False) else "off",
-                  {"friendly_name": "Immich Backup Paused"})
-    
-    ha_post_state("sensor.immich_backup_files_per_second",
-                  progress.get("files_per_second", 0),
-                  {**attrs, "unit_of_measurement": "files/s", "icon": "mdi:speedometer"})
+def _on_off(v):
+    return "on" if v else "off"
 
-    # Overall % done = (copied + skipped + failed) / total
-    total = progress.get("total", 0) or 0
-    processed = (
-        (progress.get("copied", 0) or 0)
-        + (progress.get("skipped", 0) or 0)
-        + (progress.get("failed", 0) or 0)
-    )
-    ha_post_state(
-        "sensor.immich_backup_percent_copied",
-        _pct(processed, total),
-        {"friendly_name": "Immich Backup % Complete", "unit_of_measurement": "%", "icon": "mdi:progress-check"}
-    )
+# (snapshot field, entity_id, attributes, state formatter or None)
+_HA_SENSORS = (
+    # Your original sensors
+    ("status", "sensor.immich_backup_status", {**_HA_ATTRS}, None),
+    ("status", "binary_sensor.immich_backup_running",
+     {"friendly_name": "Immich Backup Running"}, lambda v: _on_off(v == "running")),
+    ("copied", "sensor.immich_backup_copied",
+     {**_HA_ATTRS, "unit_of_measurement": "files", "icon": "mdi:file-upload"}, None),
+    ("skipped", "sensor.immich_backup_skipped",
+     {**_HA_ATTRS, "unit_of_measurement": "files", "icon": "mdi:file-cancel-outline"}, None),
+    ("failed", "sensor.immich_backup_failed",
+     {**_HA_ATTRS, "unit_of_measurement": "files", "icon": "mdi:alert-circle"}, None),
+    ("deleted", "sensor.immich_backup_deleted",
+     {**_HA_ATTRS, "unit_of_measurement": "files", "icon": "mdi:trash-can-outline"}, None),
+    ("total", "sensor.immich_backup_total",
+     {**_HA_ATTRS, "unit_of_measurement": "files", "icon": "mdi:counter"}, None),
+    ("last_run", "sensor.immich_backup_last_run",
+     {**_HA_ATTRS, "icon": "mdi:clock-outline"}, None),
+    # Enhanced: Additional sensors
+    ("paused", "binary_sensor.immich_backup_paused",
+     {"friendly_name": "Immich Backup Paused"}, _on_off),
+    ("files_per_second", "sensor.immich_backup_files_per_second",
+     {**_HA_ATTRS, "unit_of_measurement": "files/s", "icon": "mdi:speedometer"}, None),
+    ("percent", "sensor.immich_backup_percent_copied",
+     {"friendly_name": "Immich Backup % Complete", "unit_of_measurement": "%", "icon": "mdi:progress-check"}, None),
+    ("guard", "sensor.immich_backup_guard",
+     {**_HA_ATTRS, "icon": "mdi:shield-lock"}, None),
+    ("error", "sensor.immich_backup_error",
+     {**_HA_ATTRS, "icon": "mdi:alert"}, None),
+)
 
-    ha_post_state("sensor.immich_backup_guard",
-                  progress.get("guard", "") or "",
-                  {**attrs, "icon": "mdi:shield-lock"})
+def push_progress_to_ha(dirty: set[str] | None = None, snap: dict | None = None) -> set[str]:
+    """Enhanced with additional sensors; only pushes sensors whose field is in dirty (None = all).
 
-    ha_post_state("sensor.immich_backup_error",
-                  progress.get("error", "") or "",
-                  {**attrs, "icon": "mdi:alert"})
+    Returns the fields whose sensors all reached HA.
+    """
+    if not HA_TOKEN:
+        return set()
+    if snap is None:
+        snap = _ha_snapshot()
+    keys = set(snap) if dirty is None else set(dirty)
+    failed = set()
+    for key, entity_id, attributes, fmt in _HA_SENSORS:
+        if key in keys:
+            value = snap[key]
+            if not ha_post_state(entity_id, fmt(value) if fmt else value, attributes):
+                failed.add(key)
+    return keys - failed
 
 
 _last_push_ts = 0
-_last_pushed = {}
-_last_status = None
+_last_pushed = {}  # values HA acknowledged, per snapshot field
+_last_status_tried = None
 
-def maybe_push_progress_to_ha():
-    global _last_push_ts, _last_status
-    now = time.time()
+def maybe_push_progress_to_ha(p: dict | None = None):
+    """Push changed sensors: immediately on a status change, else at most every HA_PUSH_INTERVAL_SEC.
 
-    status = progress.get("status")
-    if status != _last_status:
-        _last_status = status
-        _last_push_ts = now
-        push_progress_to_ha()
+    Fields only count as pushed once HA accepted them, so a failed push is
+    retried on the next interval instead of waiting for the value to change.
+    """
+    global _last_push_ts, _last_status_tried
+    if not HA_TOKEN:
+        return
+    snap = _ha_snapshot(p)
+    dirty = {k for k, v in snap.items() if k not in _last_pushed or _last_pushed[k] != v}
+    if not dirty:
+        return
+
+    now = time.time()
+    new_status = snap["status"] != _last_status_tried
+    if not new_status and now - _last_push_ts < max(1, HA_PUSH_INTERVAL_SEC):
         return
+    _last_push_ts = now
+    _last_status_tried = snap["status"]
+    pushed = push_progress_to_ha(dirty, snap)
+    _last_pushed.update({k: snap[k] for k in pushed})
 
-    interval = max(1, int(os.environ.get("HA_PUSH_INTERVAL_SEC", "60")))
-    if now - _last_push_ts >= interval:
-        _last_push_ts = now
-        push_progress_to_ha()
+_pool = None
 
 def connect_db():
-    """Enhanced with retry logic"""
+    """Enhanced with retry logic; opens the shared connection pool"""
+    global _pool
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            conn = psycopg2.connect(
+            # minconn=1 connects immediately, so failures surface here
+            _pool = psycopg2.pool.ThreadedConnectionPool(
+                1, 4,
                 host=DB_HOST, port=DB_PORT,
                 database=DB_NAME, user=DB_USER, password=DB_PASS,
-                connect_timeout=30
+                connect_timeout=30,
+                # session-level: the COPY runs in autocommit, where SET LOCAL would be a no-op
+                options="-c search_path=public" + (f" -c work_mem={DB_WORK_MEM}" if DB_WORK_MEM else "")
             )
-            conn.autocommit = True
             logger.info(f"Database connected (attempt {attempt + 1})")
-            return conn
+            return _pool
         except psycopg2.Error as e:
             if attempt < max_retries - 1:
                 wait_time = 2 ** attempt
@@ -244,18 +349,50 @@ def connect_db():
             else:
                 raise
 
-def _columns_for_table(cur, table_name: str):
+@contextlib.contextmanager
+def db_conn():
+    """Borrow an autocommit connection from the pool"""
+    conn = _pool.getconn()
+    try:
+        conn.autocommit = True
+        yield conn
+    except Exception:
+        conn.close()  # state unknown after an error; don't hand it out again
+        raise
+    finally:
+        _pool.putconn(conn, close=bool(conn.closed))
+
+def _load_table_columns(cur, names):
+    """{table: {columns}} for whichever of names exist in 'public', in one round-trip"""
     cur.execute("""
-        SELECT column_name
+        SELECT table_name, column_name
         FROM information_schema.columns
-        WHERE table_schema='public' AND table_name=%s
-    """, (table_name,))
-    return {r[0] for r in cur.fetchall()}
+        WHERE table_schema='public' AND table_name = ANY(%s)
+    """, (list(names),))
+    tables_cols = {}
+    for table_name, column_name in cur.fetchall():
+        tables_cols.setdefault(table_name, set()).add(column_name)
+    return tables_cols
+
+def _warn_missing_fk_indexes(cur, table, fks):
+    """Log a CREATE INDEX hint for each fk column that doesn't lead any index on table"""
+    cur.execute("""
+        SELECT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = to_regclass(%s)
+    """, (f'public."{table}"',))
+    leading = {r[0] for r in cur.fetchall()}
+    for fk in fks:
+        if fk not in leading:
+            logger.warning(
+                f'No index on "{table}"."{fk}"; large libraries may export slowly. Consider: '
+                f'CREATE INDEX CONCURRENTLY ON public."{table}" ("{fk}");'
+            )
 
-def _first_existing_table(cur, names):
+def _first_existing_table(tables_cols, names):
     for name in names:
-        cur.execute("SELECT to_regclass(%s)", (f"public.{name}",))
-        if cur.fetchone()[0]:
+        if name in tables_cols:
             return name
     return None
 
@@ -265,92 +402,265 @@ def _first_in(options, available: set[str]):
             return o
     return None
 
+_COPY_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+_COPY_ESCAPE_RE = re.compile(r"\\(x[0-9a-fA-F]{1,2}|[0-7]{1,3}|.)")
+
+def _copy_unescape_sub(m):
+    esc = m.group(1)
+    if esc in _COPY_ESCAPES:
+        return _COPY_ESCAPES[esc]
+    if esc[0] == "x" and len(esc) > 1:
+        return chr(int(esc[1:], 16))
+    if esc[0] in "01234567":
+        return chr(int(esc, 8))
+    return esc  # "\\" and any other escaped char stand for themselves
+
+def _copy_field(raw: bytes):
+    """Decode one field of COPY text format (\\N is NULL)"""
+    if raw == b"\\N":
+        return None
+    s = raw.decode("utf-8")
+    return _COPY_ESCAPE_RE.sub(_copy_unescape_sub, s) if "\\" in s else s
+
+class _StopCopy(Exception):
+    """Raised from the COPY sink to abandon the transfer early"""
+
+class _CopyRowSink:
+    """File-like target for copy_expert that parses rows as the data arrives"""
+    def __init__(self, emit):
+        self._emit = emit
+        self._tail = b""
+
+    def write(self, data):
+        lines = (self._tail + data).split(b"\n")
+        self._tail = lines.pop()  # partial last line, completed by the next chunk
+        for line in lines:
+            if not self._emit(tuple(_copy_field(f) for f in line.split(b"\t"))):
+                raise _StopCopy()
+        return len(data)
+
+def _copy_rows(query, params, emit):
+    """Stream query through COPY ... TO STDOUT (text format), calling emit(row) per row.
+
+    Rows are handed over while the server is still sending, so nothing is
+    buffered beyond one network chunk. emit returns False to abandon the
+    transfer. Uses its own pooled connection.
+    """
+    with db_conn() as conn, conn.cursor() as cur:
+        # COPY takes no bind parameters; mogrify quotes them client-side
+        sql = cur.mogrify(f"COPY ({query}) TO STDOUT", params).decode("utf-8")
+        try:
+            cur.copy_expert(sql, _CopyRowSink(emit))
+        except _StopCopy:
+            conn.close()  # mid-COPY; not reusable, the pool discards it
+
+class RowPrefetcher:
+    """Run a row source on a background thread, handing rows over through a bounded queue.
+
+    source(emit) pushes rows by calling emit(row), which returns False once
+    the prefetcher is closed. Starts immediately, so the DB transfer
+    overlaps the export/source index walks and then the copy loop. Source
+    errors are re-raised to the consumer. Always close() it, even if it
+    was never iterated.
+    """
+    _END = object()
+
+    def __init__(self, source, maxsize=4096):
+        self._source = source
+        self._q = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="db-prefetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(self):
+        try:
+            self._source(self._put)
+            self._put(self._END)
+        except Exception as e:
+            self._put(e)
+
+    def __iter__(self):
+        while True:
+            item = self._q.get()
+            if item is self._END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
 def get_albums_and_assets(conn):
-    """Your original function with enhanced error handling"""
+    """Return (total, source); source(emit) streams (album_id, album_name, original_path) rows"""
     where = ""
     params = ()
+    album_tables = ["album", "albums"]
+    asset_tables = ["asset", "assets"]
+    join_tables = ["album_asset", "album_assets", "albums_assets", "albums_assets_assets", "album_assets_asset"]
     with conn.cursor() as cur:
-        # Your original logic
-        albums_table = _first_existing_table(cur, ["album", "albums"])
-        assets_table = _first_existing_table(cur, ["asset", "assets"])
+        # Your original logic, with every candidate table introspected in one query
+        tables_cols = _load_table_columns(cur, album_tables + asset_tables + join_tables)
+        albums_table = _first_existing_table(tables_cols, album_tables)
+        assets_table = _first_existing_table(tables_cols, asset_tables)
         if not albums_table or not assets_table:
             raise RuntimeError("Could not find album/asset tables in schema 'public'")
 
-        join_table = _first_existing_table(
-            cur,
-            ["album_asset", "album_assets", "albums_assets", "albums_assets_assets", "album_assets_asset"]
-        )
-        if not join_table:
+        join_table = _first_existing_table(tables_cols, join_tables)
+        if join_table:
+            jcols = tables_cols[join_table]
+        else:
+            # unknown name: find it and its columns in the same round-trip
             cur.execute("""
-                SELECT table_name FROM information_schema.tables
+                SELECT table_name, column_name FROM information_schema.columns
                 WHERE table_schema='public' AND table_name ILIKE '%album%' AND table_name ILIKE '%asset%'
+                ORDER BY table_name
             """)
-            rows = [r[0] for r in cur.fetchall()]
-            if rows:
-                join_table = rows[0]
-            else:
+            rows = cur.fetchall()
+            if not rows:
                 raise RuntimeError("Could not find album↔asset join table in schema 'public'")
+            join_table = rows[0][0]
+            jcols = {c for t, c in rows if t == join_table}
 
-        jcols = _columns_for_table(cur, join_table)
         album_fk = _first_in(["albumId", "albumsId"], jcols)
         asset_fk = _first_in(["assetId", "assetsId"], jcols)
         if not album_fk or not asset_fk:
             raise RuntimeError(f"Join table '{join_table}' missing album/asset FK columns")
+        # only a hint: this is Immich's database, so never create it ourselves
+        _warn_missing_fk_indexes(cur, join_table, (album_fk, asset_fk))
 
-        acols = _columns_for_table(cur, albums_table)
+        acols = tables_cols[albums_table]
         album_name_col = _first_in(["albumName", "name", "title"], acols) or "name"
         owner_col = "ownerId" if "ownerId" in acols else None
 
-        scols = _columns_for_table(cur, assets_table)
+        scols = tables_cols[assets_table]
         asset_path_col = _first_in(["originalPath", "original_path", "originalFilePath", "fileOriginalPath"], scols) or "originalPath"
 
         if USER_ID and owner_col:
             where = f'WHERE a."{owner_col}" = %s'
             params = (USER_ID,)
 
-        q = f'''
-            SELECT a.id, a."{album_name_col}", s."{asset_path_col}"
+        source = f'''
             FROM "{albums_table}" a
             JOIN "{join_table}" aa ON a.id = aa."{album_fk}"
             JOIN "{assets_table}" s ON aa."{asset_fk}" = s.id
             {where}
-            ORDER BY a."{album_name_col}", s."{asset_path_col}"
         '''
         logger.info(f"Using tables: {albums_table}, {assets_table}, join {join_table} ({album_fk}->{asset_fk})")
-        cur.execute(q, params)
-        return cur.fetchall()
+        # rows are streamed, so get the progress denominator up front
+        cur.execute(f"SELECT count(*) {source}", params)
+        total = cur.fetchone()[0]
+
+    # no ORDER BY: copy order doesn't matter and a sort would hold back the first row
+    q = f'''
+        SELECT a.id, a."{album_name_col}", s."{asset_path_col}"
+        {source}
+    '''
+    return total, functools.partial(_copy_rows, q, params)
+
+# One writer at a time: the .tmp path and the HA connection are shared
+_write_lock = threading.Lock()
+# Set after mutating `progress`; the flusher thread picks it up
+_progress_dirty = threading.Event()
+
+def _dump_progress(snap: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(snap, option=orjson.OPT_INDENT_2)
+    return json.dumps(snap, indent=2).encode()
 
 def write_progress():
-    try:
-        progress["last_run"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        os.makedirs(os.path.dirname(PROGRESS_FILE), exist_ok=True)
-        tmp = PROGRESS_FILE + ".tmp"
-        with open(tmp, "w") as f:
-            json.dump(progress, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp, PROGRESS_FILE)  # atomic on same filesystem
-    except Exception as e:
-        logger.error(f"Failed to write progress: {e}")
-    # push to HA (throttled)
-    maybe_push_progress_to_ha()
+    """Persist progress.json now; per-file updates go through _ProgressFlusher instead"""
+    with _write_lock:
+        with _progress_lock:
+            progress["last_run"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            snap = dict(progress)
+        try:
+            os.makedirs(os.path.dirname(PROGRESS_FILE), exist_ok=True)
+            tmp = PROGRESS_FILE + ".tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, _dump_progress(snap))
+                if PROGRESS_FSYNC:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp, PROGRESS_FILE)  # atomic on same filesystem
+        except Exception as e:
+            logger.error(f"Failed to write progress: {e}")
+        # push to HA (throttled)
+        maybe_push_progress_to_ha(snap)
+
+class _ProgressFlusher:
+    """Write progress.json on a background thread whenever _progress_dirty is set.
+
+    Keeps serialisation and HA pushes off the copy loop, at most one write
+    per interval. close() does not write; callers finish with their own
+    write_progress().
+    """
+
+    def __init__(self, interval=PROGRESS_WRITE_INTERVAL_SEC):
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="progress-flush", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            _progress_dirty.wait()
+            if self._stop.is_set():
+                return
+            _progress_dirty.clear()
+            write_progress()
+            self._stop.wait(self._interval)
+
+    def close(self):
+        self._stop.set()
+        _progress_dirty.set()  # wake it if idle
+        self._thread.join()
+        _progress_dirty.clear()
 
 
 def fail(e, label):
     logger.error(f"{label}: {e}")
-    progress["status"] = "failed"
-    progress["error"] = f"{label}: {e}\n"
-    progress["traceback"] = traceback.format_exc()
+    with _progress_lock:
+        progress["status"] = "failed"
+        progress["error"] = f"{label}: {e}\n"
+        progress["traceback"] = traceback.format_exc()
     write_progress()
 
+class _SanitizeTable(dict):
+    """str.translate table keeping letters/numbers/space/underscore/dash.
+
+    Filled lazily per code point, so translate() stays a single C call
+    while keeping the full Unicode isalnum() rules.
+    """
+    def __missing__(self, cp):
+        ch = chr(cp)
+        keep = cp if ch.isalnum() or ch in " _-" else None
+        self[cp] = keep
+        return keep
+
+_SANITIZE_TABLE = _SanitizeTable()
+
+@functools.lru_cache(maxsize=4096)
 def sanitize(name):
     
     if not name:
         return "Unknown_Album"
-    # normalize unicode so accents/variants behave consistently
-    n = unicodedata.normalize("NFKD", name)
+    # normalize unicode so accents/variants behave consistently (no-op for ASCII)
+    n = name if name.isascii() else unicodedata.normalize("NFKD", name)
     # keep only letters/numbers/space/underscore/dash (no dots, no symbols)
-    cleaned = "".join(c for c in n if c.isalnum() or c in (" ", "_", "-"))
+    cleaned = n.translate(_SANITIZE_TABLE)
     # collapse multiple spaces and trim
     cleaned = " ".join(cleaned.split()).strip()
     # optional: cap length to avoid crazy-long filenames
@@ -374,150 +684,448 @@ def assets_root_available() -> bool:
         logger.error(f"Error checking ASSETS_ROOT: {e}")
         return False
 
+_ASSETS_PREFIX = ASSETS_ROOT.rstrip("/") + "/" if ASSETS_ROOT else ""
+
+def _asset_rel_path(orig_path: str) -> str:
+    """Immich DB path -> path relative to ASSETS_ROOT (before upload/ prefix stripping)"""
+    rel = orig_path.replace("\\", "/").lstrip("/")
+    if rel.startswith("usr/src/app/"):
+        rel = rel[12:]
+    return rel
+
+@functools.lru_cache(maxsize=100_000)
 def translate_path(orig_path: str) -> str:
-    """Your original function unchanged"""
-    if not orig_path:
+    """Your original function, minus the per-call candidate list.
+
+    Cached, so an asset shared by several albums is probed once per run.
+    """
+    if not orig_path or not ASSETS_ROOT:
         return orig_path
     if os.path.isfile(orig_path):
         return orig_path
-    if not ASSETS_ROOT:
-        return orig_path
-
-    rel = orig_path.replace("\\", "/").lstrip("/")
-    if rel.startswith("usr/src/app/"):
-        rel = rel[len("usr/src/app/"):]
 
-    candidates = [
-        os.path.join(ASSETS_ROOT, rel),
-    ]
+    rel = _asset_rel_path(orig_path)
+    # plain concatenation: ASSETS_ROOT is trusted and rel is never absolute
+    p = _ASSETS_PREFIX + rel
+    if os.path.isfile(p):
+        return p
     if rel.startswith("upload/upload/"):
-        candidates.append(os.path.join(ASSETS_ROOT, rel[len("upload/upload/"):]))
+        p = _ASSETS_PREFIX + rel[14:]
+        if os.path.isfile(p):
+            return p
     if rel.startswith("upload/"):
-        candidates.append(os.path.join(ASSETS_ROOT, rel[len("upload/"):]))
-
-    for c in candidates:
-        if os.path.isfile(c):
-            return c
+        p = _ASSETS_PREFIX + rel[7:]
+        if os.path.isfile(p):
+            return p
     return orig_path
 
-def get_existing_files_map():
-    """Your original function with enhanced logging"""
-    file_map = {}
-    exts = {
-        ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp",
-        ".raw", ".dng", ".cr2", ".nef", ".arw", ".orf", ".rw2",
-        ".pef", ".x3f", ".srw", ".raf", ".3fr", ".fff", ".iiq",
-        ".k25", ".kdc", ".mos", ".mef", ".nrw", ".ptx", ".pxn",
-        ".r3d", ".rwl", ".rwz", ".mp4", ".mov", ".avi",
-        ".mkv", ".m4v", ".3gp", ".webm"
-    }
+# Immich keeps originals in these; thumbs/, encoded-video/, profile/ and backups/ are derived
+_ORIGINALS_DIRS = ("library", "upload")
+
+def _originals_roots():
+    """Directories under ASSETS_ROOT that can hold originals; ASSETS_ROOT itself if none is found.
+
+    ASSETS_ROOT may be Immich's upload location or its parent, whose upload/
+    is then the upload location.
+    """
+    base = _ASSETS_PREFIX
+    if any(os.path.isdir(f"{base}upload/{d}") for d in (*_ORIGINALS_DIRS, "thumbs")):
+        base += "upload/"
+    roots = [base + d for d in _ORIGINALS_DIRS if os.path.isdir(base + d)]
+    return roots or [ASSETS_ROOT]
+
+def build_source_index():
+    """Relative paths of the files under ASSETS_ROOT's originals, from one scandir walk.
+
+    Anything outside them is still found by translate_path on a miss.
+    """
+    start = time.time()
+    cut = len(_ASSETS_PREFIX)
+    roots = _originals_roots()
+    index = {e.path[cut:] for root in roots for e in _iter_files(root)}
+    logger.info(f"Indexed {len(index)} files under {', '.join(roots)} in {time.time() - start:.1f}s")
+    return index
+
+def resolve_source(orig_path: str, src_index) -> str:
+    """translate_path via the startup index; only touches the disk on a miss"""
+    if src_index and orig_path:
+        rel = _asset_rel_path(orig_path)
+        if rel in src_index:
+            return _ASSETS_PREFIX + rel
+        if rel.startswith("upload/upload/") and rel[14:] in src_index:
+            return _ASSETS_PREFIX + rel[14:]
+        if rel.startswith("upload/") and rel[7:] in src_index:
+            return _ASSETS_PREFIX + rel[7:]
+    # not indexed (added mid-run, symlinked, or outside ASSETS_ROOT)
+    return translate_path(orig_path)
+
+# media extensions kept in the export tree (lower case, no leading dot)
+_MEDIA_EXTS = frozenset({
+    "jpg", "jpeg", "png", "gif", "bmp", "tiff", "webp",
+    "raw", "dng", "cr2", "nef", "arw", "orf", "rw2",
+    "pef", "x3f", "srw", "raf", "3fr", "fff", "iiq",
+    "k25", "kdc", "mos", "mef", "nrw", "ptx", "pxn",
+    "r3d", "rwl", "rwz", "mp4", "mov", "avi",
+    "mkv", "m4v", "3gp", "webm"
+})
+_SKIP_NAMES = frozenset({"progress.json", "manifest.sqlite", ".DS_Store", "Thumbs.db"})
+
+def _scan_dir(path):
+    """(subdir paths, file DirEntries) of one directory (d_type from scandir, no extra stat)"""
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    dirs.append(e.path)
+                elif e.is_file(follow_symlinks=False):
+                    files.append(e)
+    except OSError as err:
+        # os.walk silently skipped unreadable dirs; keep that behaviour
+        logger.debug("Cannot scan %s: %s", err.filename, err)
+    return dirs, files
+
+def _iter_files(root, workers=None):
+    """Yield DirEntry for every regular file under root, in no particular order.
+
+    Directories are listed on SCAN_WORKERS threads so per-directory
+    latency on NFS/SMB mounts overlaps.
+    """
+    workers = SCAN_WORKERS if workers is None else workers
+    if workers <= 1:
+        stack = [root]
+        while stack:
+            dirs, files = _scan_dir(stack.pop())
+            stack.extend(dirs)
+            yield from files
+        return
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending = {ex.submit(_scan_dir, root)}
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                dirs, files = fut.result()
+                pending.update(ex.submit(_scan_dir, d) for d in dirs)
+                yield from files
+
+def _is_media_name(name):
+    dot = name.rfind(".")
+    # dot > 0: like splitext, a leading-dot name (".jpg") has no extension
+    return dot > 0 and name[dot + 1:].lower() in _MEDIA_EXTS
+
+def get_existing_files():
+    """Set of media files currently in the export directory"""
+    on_disk = set()
     if not os.path.exists(EXPORT_DIR):
-        return file_map
+        return on_disk
     
-    for root, _, files in os.walk(EXPORT_DIR):
-        for f in files:
-            if f in {"progress.json", ".DS_Store", "Thumbs.db"}:
-                continue
-            if os.path.splitext(f)[1].lower() in exts:
-                file_map[os.path.join(root, f)] = False
+    for e in _iter_files(EXPORT_DIR):
+        name = e.name
+        if name not in _SKIP_NAMES and _is_media_name(name):
+            on_disk.add(e.path)
     
-    logger.info(f"Found {len(file_map)} existing files in export directory")
-    return file_map
+    logger.info(f"Found {len(on_disk)} existing files in export directory")
+    return on_disk
+
+# errnos meaning "this kernel/filesystem can't do that", not a real I/O failure
+_NO_FAST_COPY = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+
+def _kernel_copy(fd_in, fd_out, size) -> bool:
+    """Copy fd_in to EOF without a user-space buffer; False if unsupported.
+
+    size is only a hint for the chunk size (same heuristic as shutil), so
+    a file that grew since it was stat()ed is still copied whole. Like
+    shutil, an immediate EOF on a non-empty file counts as unsupported:
+    some filesystems report 0 instead of failing.
+    """
+    blocksize = max(min(size, 2 ** 30), 2 ** 23)
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while True:
+                n = os.copy_file_range(fd_in, fd_out, blocksize)
+                if n == 0:
+                    if copied or not size:
+                        return True
+                    break  # nothing moved; try sendfile
+                copied += n
+        except OSError as e:
+            if e.errno not in _NO_FAST_COPY or copied:
+                raise
+    try:
+        while True:
+            n = os.sendfile(fd_out, fd_in, copied, blocksize)
+            if n == 0:
+                return bool(copied or not size)
+            copied += n
+    except OSError as e:
+        if e.errno not in _NO_FAST_COPY or copied:
+            raise
+    return False
+
+def _fast_copy(src, dst, src_st=None):
+    """shutil.copy2 equivalent using copy_file_range/sendfile (reflinks on btrfs/XFS).
+
+    Pass src_st when the caller already stat()ed src; its size, mode and
+    times are then applied directly instead of stat()ing src again.
+    """
+    fd_in = os.open(src, os.O_RDONLY)
+    try:
+        if src_st is None:
+            src_st = os.fstat(fd_in)
+        fd_out = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            done = _kernel_copy(fd_in, fd_out, src_st.st_size)
+            if done:
+                # what copystat does, on the open fd instead of re-resolving both paths
+                os.fchmod(fd_out, stat.S_IMODE(src_st.st_mode))
+                os.utime(fd_out, ns=(src_st.st_atime_ns, src_st.st_mtime_ns))
+        finally:
+            os.close(fd_out)
+    finally:
+        os.close(fd_in)
+    if not done:
+        shutil.copyfile(src, dst)
+        shutil.copystat(src, dst)
+
+_MANIFEST_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS synced (
+        dest_path TEXT PRIMARY KEY,
+        src_path  TEXT NOT NULL,
+        size      INTEGER NOT NULL,
+        mtime_ns  INTEGER NOT NULL
+    )
+"""
 
-def copy_assets(albums_assets):
-    """Enhanced with pause/resume and better progress tracking"""
-    global pause_requested, shutdown_requested
-    
-    progress.update({
-        "status": "running", 
-        "copied": 0, "skipped": 0, "failed": 0, "deleted": 0,
-        "can_pause": True, "can_resume": False
-    })
-    progress["total"] = len(albums_assets)
+def load_manifest():
+    """{dest_path: (size, mtime_ns)} of the source each export file was last synced from"""
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    try:
+        with contextlib.closing(sqlite3.connect(MANIFEST_FILE)) as db:
+            db.execute(_MANIFEST_SCHEMA)
+            rows = db.execute("SELECT dest_path, size, mtime_ns FROM synced")
+            return {dest: (size, mtime_ns) for dest, size, mtime_ns in rows}
+    except sqlite3.Error as e:
+        logger.warning(f"Ignoring unreadable manifest {MANIFEST_FILE}: {e}")
+        return {}
+
+def save_manifest(synced=(), removed=()):
+    """Upsert (dest_path, src_path, size, mtime_ns) rows and drop removed dest paths"""
+    try:
+        with contextlib.closing(sqlite3.connect(MANIFEST_FILE)) as db, db:
+            db.execute(_MANIFEST_SCHEMA)
+            db.executemany("INSERT OR REPLACE INTO synced VALUES (?, ?, ?, ?)", synced)
+            db.executemany("DELETE FROM synced WHERE dest_path = ?", ((p,) for p in removed))
+    except sqlite3.Error as e:
+        # only costs a destination stat per file next run
+        logger.warning(f"Failed to update manifest {MANIFEST_FILE}: {e}")
+
+_made_dirs = set()
+_dirs_lock = threading.Lock()
+
+def _copy_one(dest_dir, orig_path, on_disk, src_index, manifest):
+    """Copy a single asset into its album folder dest_dir.
+
+    Runs on a worker thread. on_disk, src_index and manifest are the
+    (read-only) export index, source index and manifest loaded at startup.
+    Returns (status, asset_path, dest_path, src_st) where status is one of
+    "missing", "skipped", "copied" or "failed".
+    """
+    asset_path = resolve_source(orig_path, src_index)
+    try:
+        src_st = os.stat(asset_path) if asset_path else None
+    except OSError:
+        src_st = None
+    if src_st is None or not stat.S_ISREG(src_st.st_mode):
+        logger.debug("Skipping missing asset: %s", asset_path)
+        return "missing", asset_path, None, None
+
+    # create each album dir once; concurrent makedirs on the same path is wasted syscalls
+    with _dirs_lock:
+        if dest_dir not in _made_dirs:
+            os.makedirs(dest_dir, exist_ok=True)
+            _made_dirs.add(dest_dir)
+    name = os.path.basename(asset_path)
+    dest_path = os.path.join(dest_dir, name)
+
+    # exported earlier from a source that hasn't changed since: no need to stat the copy
+    if dest_path in on_disk and manifest.get(dest_path) == (src_st.st_size, src_st.st_mtime_ns):
+        logger.debug("Unchanged since last sync, skipping: %s", dest_path)
+        return "skipped", asset_path, dest_path, src_st
+
+    # media files missing from the startup index don't exist yet; only
+    # stat when the index can't answer (indexed, or not a media extension)
+    dst_st = None
+    if dest_path in on_disk or not _is_media_name(name):
+        try:
+            dst_st = os.stat(dest_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error("Error with %s: %s", dest_path, e)
+            return "failed", asset_path, dest_path, src_st
+
+    if dst_st is not None:
+        if src_st.st_size == dst_st.st_size:
+            logger.debug("Already exists, skipping: %s", dest_path)
+            return "skipped", asset_path, dest_path, src_st
+        try:
+            _fast_copy(asset_path, dest_path, src_st)
+            logger.debug("Updated: %s -> %s", asset_path, dest_path)
+            return "copied", asset_path, dest_path, src_st
+        except Exception as e:
+            logger.error("Error with %s: %s", dest_path, e)
+            return "failed", asset_path, dest_path, src_st
+    try:
+        _fast_copy(asset_path, dest_path, src_st)
+        logger.debug("Copied: %s -> %s", asset_path, dest_path)
+        return "copied", asset_path, dest_path, src_st
+    except Exception as e:
+        logger.error("Failed copy %s: %s", asset_path, e)
+        return "failed", asset_path, dest_path, src_st
+
+def _copy_after(prev, *args):
+    """_copy_one once prev, a copy to the same destination file, has finished"""
+    wait((prev,))
+    return _copy_one(*args)
+
+def _remove_file(path):
+    """os.remove for executor.map: return the error instead of raising"""
+    try:
+        os.remove(path)
+        return None
+    except Exception as e:
+        return e
+
+def copy_assets(albums_assets, total):
+    """Enhanced with pause/resume, parallel copies and better progress tracking.
+
+    albums_assets may be any iterable (e.g. a streaming cursor); total is
+    the expected row count used for progress reporting. Per-file progress
+    is only flagged dirty; a running _ProgressFlusher writes it out.
+    """
+    with _progress_lock:
+        progress.update({
+            "status": "running", 
+            "copied": 0, "skipped": 0, "failed": 0, "deleted": 0,
+            "can_pause": True, "can_resume": False
+        })
+        progress["total"] = total
     write_progress()
 
-    existing_map = get_existing_files_map()
-    total = progress["total"]
+    on_disk = get_existing_files()
+    manifest = load_manifest()
+    kept = set()
+    synced = []  # manifest rows that are new or changed this run
+    src_index = build_source_index() if ASSETS_ROOT and INDEX_ASSETS_ROOT else None
+    _made_dirs.clear()
+    translate_path.cache_clear()  # answers are only valid for one run
     found_on_disk = 0
     start_time = time.time()
 
-    for i, (_, album_name, orig_path) in enumerate(albums_assets, start=1):
-        # Enhanced: Handle pause/resume
-        while pause_requested and not shutdown_requested:
-            progress["paused"] = True
-            progress["can_resume"] = True
-            progress["can_pause"] = False
-            write_progress()
-            time.sleep(1)
-            
-        if shutdown_requested:
-            logger.info("Shutdown requested, stopping gracefully")
-            break
-            
-        if progress.get("paused") and not pause_requested:
-            progress["paused"] = False
-            progress["can_pause"] = True
-            progress["can_resume"] = False
-        
-        asset_path = translate_path(orig_path)
-        if not asset_path or not os.path.isfile(asset_path):
-            logger.debug(f"Skipping missing asset: {asset_path}")
-            progress["skipped"] += 1
-            if i % 10 == 0 or i == total:
+    def record(fut, album_name, dest_key):
+        nonlocal found_on_disk
+        if inflight.get(dest_key) is fut:
+            del inflight[dest_key]
+        status, asset_path, dest_path, src_st = fut.result()
+        if status != "missing":
+            found_on_disk += 1
+            kept.add(dest_path)
+            if status != "failed":
+                sig = (src_st.st_size, src_st.st_mtime_ns)
+                if manifest.get(dest_path) != sig:
+                    synced.append((dest_path, asset_path, *sig))
+        elapsed = time.time() - start_time
+        with _progress_lock:
+            if status == "missing":
+                progress["skipped"] += 1
+            else:
+                progress[status] += 1
+                # Enhanced: Track current processing
+                progress["current_album"] = album_name
+                progress["current_file"] = os.path.basename(asset_path)
+
+            # Enhanced: Calculate performance stats
+            if elapsed > 0:
+                processed = progress["copied"] + progress["skipped"] + progress["failed"]
+                progress["files_per_second"] = round(processed / elapsed, 2)
+
+                if processed < total:
+                    remaining = total - processed
+                    estimated_remaining = remaining / (processed / elapsed)
+                    progress["estimated_remaining"] = int(estimated_remaining)
+
+        _progress_dirty.set()  # written by the flusher thread
+
+    # Keep the submit queue short so pause/shutdown take effect promptly;
+    # results are folded into `progress` on this thread only.
+    max_pending = PARALLEL_COPIES * 4
+    pending = {}  # future -> (album_name, dest_key)
+    # (album dir, file name) -> last copy submitted for it; assets sharing a
+    # basename in one album must not write the same file concurrently
+    inflight = {}
+    # rows are unordered but mostly grouped by album; sanitize() is cached for the rest
+    last_album = None
+    dest_dir = None
+    with ThreadPoolExecutor(max_workers=PARALLEL_COPIES) as ex:
+        for _, album_name, orig_path in albums_assets:
+            # Enhanced: Handle pause/resume
+            if pause_requested and not shutdown_requested:
+                logger.info("Pause requested")
+                with _progress_lock:
+                    progress["paused"] = True
+                    progress["can_resume"] = True
+                    progress["can_pause"] = False
+                write_progress()
+                wait_while_paused()
+
+            if shutdown_requested:
+                logger.info("Shutdown requested, stopping gracefully")
+                break
+                
+            if progress.get("paused"):
+                logger.info("Resume requested")
+                with _progress_lock:
+                    progress["paused"] = False
+                    progress["can_pause"] = True
+                    progress["can_resume"] = False
                 write_progress()
-            continue
-
-        found_on_disk += 1
-        safe = sanitize(album_name)
-        dest_dir = os.path.join(EXPORT_DIR, safe)
-        os.makedirs(dest_dir, exist_ok=True)
-        dest_path = os.path.join(dest_dir, os.path.basename(asset_path))
-
-        # Enhanced: Track current processing
-        progress["current_album"] = album_name
-        progress["current_file"] = os.path.basename(asset_path)
 
-        if dest_path in existing_map:
-            existing_map[dest_path] = True
+            if len(pending) >= max_pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    record(fut, *pending.pop(fut))
+            if album_name != last_album or dest_dir is None:
+                dest_dir = os.path.join(EXPORT_DIR, sanitize(album_name))
+                last_album = album_name
+            # resolving the source only changes the directory, never the file name;
+            # a NULL path has no destination and is counted as missing
+            dest_key = (dest_dir, os.path.basename(orig_path.replace("\\", "/"))) if orig_path else None
+            args = (dest_dir, orig_path, on_disk, src_index, manifest)
+            prev = inflight.get(dest_key)
+            # the executor is FIFO, so prev is already running or ahead in the queue
+            fut = ex.submit(_copy_after, prev, *args) if prev else ex.submit(_copy_one, *args)
+            if dest_key is not None:
+                inflight[dest_key] = fut
+            pending[fut] = (album_name, dest_key)
 
-        if os.path.exists(dest_path):
-            try:
-                if os.path.getsize(asset_path) == os.path.getsize(dest_path):
-                    logger.debug(f"Already exists, skipping: {dest_path}")
-                    progress["skipped"] += 1
-                else:
-                    shutil.copy2(asset_path, dest_path)
-                    logger.debug(f"Updated: {asset_path} -> {dest_path}")
-                    progress["copied"] += 1
-            except Exception as e:
-                logger.error(f"Error with {dest_path}: {e}")
-                progress["failed"] += 1
-        else:
-            try:
-                shutil.copy2(asset_path, dest_path)
-                logger.debug(f"Copied: {asset_path} -> {dest_path}")
-                progress["copied"] += 1
-            except Exception as e:
-                logger.error(f"Failed copy {asset_path}: {e}")
-                progress["failed"] += 1
-
-        # Enhanced: Calculate performance stats
-        elapsed = time.time() - start_time
-        if elapsed > 0:
-            processed = progress["copied"] + progress["skipped"] + progress["failed"]
-            progress["files_per_second"] = round(processed / elapsed, 2)
-            
-            if processed < total:
-                remaining = total - processed
-                estimated_remaining = remaining / (processed / elapsed)
-                progress["estimated_remaining"] = int(estimated_remaining)
-
-        if i % 10 == 0 or i == total:
-            write_progress()
+        if shutdown_requested:
+            # drop queued copies; only the ones already running finish
+            ex.shutdown(wait=False, cancel_futures=True)
+        for fut in list(pending):
+            album_name, dest_key = pending.pop(fut)
+            if not fut.cancelled():
+                record(fut, album_name, dest_key)
+    if synced:
+        save_manifest(synced)
 
     # Your original deletion guard logic
     guard_reason = None
-    if not assets_root_available():
+    if shutdown_requested:
+        # not every asset was seen, so "not kept" doesn't mean "gone from Immich"
+        guard_reason = "interrupted_before_all_assets_processed"
+    elif not assets_root_available():
         guard_reason = "assets_root_unavailable_or_empty"
     elif found_on_disk == 0:
         guard_reason = "no_source_files_found"
@@ -531,28 +1139,42 @@ def copy_assets(albums_assets):
 
     if guard_reason:
         logger.warning(f"Deletion guard triggered: {guard_reason}. Skipping cleanup deletions.")
-        progress["guard"] = guard_reason
-        progress["status"] = "complete"
+        with _progress_lock:
+            progress["guard"] = guard_reason
+            progress["status"] = "complete"
         write_progress()
         return
 
     # Clean up files no longer present in Immich
-    for path, keep in existing_map.items():
-        if not keep:
+    to_delete = list(on_disk - kept)
+    if to_delete:
+        removed = []
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as ex:
+            for path, err in zip(to_delete, ex.map(_remove_file, to_delete)):
+                if err is None:
+                    logger.debug("Deleted: %s", path)
+                    removed.append(path)
+                    with _progress_lock:
+                        progress["deleted"] += 1
+                    _progress_dirty.set()
+                else:
+                    logger.error("Failed delete %s: %s", path, err)
+
+        save_manifest(removed=removed)
+
+        # deepest first so emptied parents can go too; not worth parallelising
+        parents = {os.path.dirname(p) for p in to_delete} - {EXPORT_DIR}
+        for parent in sorted(parents, key=lambda d: d.count(os.sep), reverse=True):
             try:
-                os.remove(path)
-                logger.debug(f"Deleted: {path}")
-                progress["deleted"] += 1
-                parent = os.path.dirname(path)
-                if parent != EXPORT_DIR and not os.listdir(parent):
-                    os.rmdir(parent)
-                    logger.debug(f"Removed empty dir: {parent}")
-            except Exception as e:
-                logger.error(f"Failed delete {path}: {e}")
-
-    progress["status"] = "complete"
-    progress["can_pause"] = False
-    progress["can_resume"] = False
+                os.rmdir(parent)  # fails with ENOTEMPTY unless empty
+                logger.debug("Removed empty dir: %s", parent)
+            except OSError:
+                pass
+
+    with _progress_lock:
+        progress["status"] = "complete"
+        progress["can_pause"] = False
+        progress["can_resume"] = False
     write_progress()
 
 def main():
@@ -562,25 +1184,32 @@ def main():
     
     try:
         logger.info(f"Connecting to database {DB_HOST}:{DB_PORT}...")
-        conn = connect_db()
+        pool = connect_db()
         
-        with conn.cursor() as cur:
-            cur.execute("SET search_path TO public;")
-            cur.execute("SELECT 1;")
-        logger.info("Database connection verified")
+        with db_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            logger.info("Database connection verified")
 
-        logger.info("Fetching albums and assets...")
-        assets = get_albums_and_assets(conn)
-        logger.info(f"Found {len(assets)} assets in DB")
+            logger.info("Fetching albums and assets...")
+            total, source = get_albums_and_assets(conn)
+        logger.info(f"Found {total} assets in DB")
+        assets = RowPrefetcher(source)
+        flusher = _ProgressFlusher()
 
-        if assets:
-            copy_assets(assets)
-        else:
-            logger.warning("No assets found to export")
-            progress["status"] = "complete"
-            write_progress()
+        try:
+            if total:
+                copy_assets(assets, total)
+            else:
+                logger.warning("No assets found to export")
+                with _progress_lock:
+                    progress["status"] = "complete"
+                write_progress()
+        finally:
+            assets.close()  # stop the fetch thread before closing the pool
+            flusher.close()
 
-        conn.close()
+        pool.closeall()
         logger.info("Export completed successfully")
 
     except psycopg2.Error as e:
@@ -17,6 +17,7 @@ ASSETS_ROOT=$(bashio::config 'assets_root')
 # Deletion guard thresholds (may be unset -> "null")
 MIN_FOUND_ABS=$(bashio::config 'min_found_abs')
 MIN_FOUND_FRACTION=$(bashio::config 'min_found_fraction')
+PARALLEL_COPIES=$(bashio::config 'parallel_copies')
 
 # Defaults for advanced options if empty or "null"
 if [ -z "$MIN_FOUND_ABS" ] || [ "$MIN_FOUND_ABS" = "null" ]; then
@@ -29,11 +30,14 @@ fi
 if [ -z "$HA_PUSH_INTERVAL_SEC" ] || [ "$HA_PUSH_INTERVAL_SEC" = "null" ]; then
   HA_PUSH_INTERVAL_SEC=60
 fi
+if [ -z "$PARALLEL_COPIES" ] || [ "$PARALLEL_COPIES" = "null" ]; then
+  PARALLEL_COPIES=4
+fi
 
 # Export environment variables for all child processes (webgui & cron)
 export EXPORT_DIR DB_HOST DB_NAME DB_USER DB_PASS IMMICH_USER_ID
 export ASSETS_ROOT MIN_FOUND_ABS MIN_FOUND_FRACTION
-export HA_PUSH_INTERVAL_SEC
+export HA_PUSH_INTERVAL_SEC PARALLEL_COPIES
 export ADDON_VERSION
 
 # Log configuration (redact password)
@@ -47,6 +51,7 @@ bashio::log.info "Schedule: ${SCHEDULE}"
 bashio::log.info "Assets Root (library mount): ${ASSETS_ROOT}"
 bashio::log.info "Safety thresholds: MIN_FOUND_ABS=${MIN_FOUND_ABS}, MIN_FOUND_FRACTION=${MIN_FOUND_FRACTION}"
 bashio::log.info "HA push interval: ${HA_PUSH_INTERVAL_SEC}s (FIXED - was defaulting to 15)"
+bashio::log.info "Parallel copies: ${PARALLEL_COPIES}"
 bashio::log.info "Add-on version: ${ADDON_VERSION}"
 
 # Create export directory if it doesn't exist
@@ -55,7 +60,7 @@ mkdir -p "${EXPORT_DIR}"
 # Create cron job with the schedule from options.json
 bashio::log.info "Creating cron job with schedule: ${SCHEDULE}"
 cat > /etc/cron.d/immich_export << EOF
-${SCHEDULE} root EXPORT_DIR="${EXPORT_DIR}" DB_HOST="${DB_HOST}" DB_NAME="${DB_NAME}" DB_USER="${DB_USER}" DB_PASS="${DB_PASS}" IMMICH_USER_ID="${IMMICH_USER_ID}" ASSETS_ROOT="${ASSETS_ROOT}" MIN_FOUND_ABS="${MIN_FOUND_ABS}" MIN_FOUND_FRACTION="${MIN_FOUND_FRACTION}" HA_PUSH_INTERVAL_SEC="${HA_PUSH_INTERVAL_SEC}" /usr/bin/python3 /usr/src/app/export_immich_albums_db.py >> /tmp/immich_export.log 2>&1
+${SCHEDULE} root EXPORT_DIR="${EXPORT_DIR}" DB_HOST="${DB_HOST}" DB_NAME="${DB_NAME}" DB_USER="${DB_USER}" DB_PASS="${DB_PASS}" IMMICH_USER_ID="${IMMICH_USER_ID}" ASSETS_ROOT="${ASSETS_ROOT}" MIN_FOUND_ABS="${MIN_FOUND_ABS}" MIN_FOUND_FRACTION="${MIN_FOUND_FRACTION}" HA_PUSH_INTERVAL_SEC="${HA_PUSH_INTERVAL_SEC}" PARALLEL_COPIES="${PARALLEL_COPIES}" /usr/bin/python3 /usr/src/app/export_immich_albums_db.py >> /tmp/immich_export.log 2>&1
 EOF
 chmod 0644 /etc/cron.d/immich_export
 
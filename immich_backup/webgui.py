@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
-import os, json, time, threading, subprocess
-from flask import Flask, jsonify, request, Response
+import os, json, time, threading, subprocess, select, atexit, hashlib, fcntl, gzip, ctypes, struct
+from flask import Flask, request, Response, send_file
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
 
 ADDON_VERSION = os.environ.get("ADDON_VERSION", "unknown")
 
@@ -13,108 +18,287 @@ RUN_LOG       = "/tmp/immich_run.log"
 WEB_LOG       = "/tmp/immich_webgui.log"
 
 app = Flask(__name__)
-_last_progress = None
+_web_log_fh = None  # opened on first log(), then kept for the life of the process
+_web_log_lock = threading.Lock()
+# (st_mtime_ns, st_size), raw bytes, parsed dict of the last good progress.json read;
+# one tuple so request threads always see a consistent triple
+_progress_cache = (None, None, None)
+# True once an inotify watch keeps _progress_cache current; requests then skip the stat()
+_progress_watched = False
+# Notified on exporter output and progress.json changes so /events streams react at once; they still
+# re-check every second for runs started by cron
+_changed = threading.Condition()
+# pidfd of the exporter this process started: a liveness check that can't be fooled by pid reuse
+_export = {"pid": None, "pidfd": None}
+_export_lock = threading.Lock()
+# Serialises our own flock probes/acquisitions so a probe never makes run-now lose the race
+_flock_mutex = threading.Lock()
 
 # --- helpers ---
+if orjson is not None:
+    _dumps, _loads = orjson.dumps, orjson.loads
+else:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    _loads = json.loads
+
+def json_response(obj, status=200):
+    return Response(_dumps(obj), status=status, mimetype="application/json")
+
 def log(msg: str):
+    global _web_log_fh
     ts = time.strftime("%Y-%m-%d %H:%M:%S")
     line = f"[{ts}] {msg}"
     print(line, flush=True)
-    try:
-        with open(WEB_LOG, "a") as f:
-            f.write(line + "\n")
-    except Exception:
-        pass
-
-def read_progress():
-    """Return progress; tolerate concurrent writes by retrying and caching last good."""
-    global _last_progress
-    for _ in range(3):
+    with _web_log_lock:
         try:
-            with open(PROGRESS_FILE, "r") as f:
-                data = json.load(f)
-            _last_progress = data
-            return data
+            if _web_log_fh is None:
+                _web_log_fh = open(WEB_LOG, "a", buffering=1)  # line-buffered
+                atexit.register(_web_log_fh.close)
+            _web_log_fh.write(line + "\n")
         except Exception:
-            time.sleep(0.05)  # tiny backoff while exporter is swapping files
-    # if we still can't read, return last good to avoid UI flicker
-    return _last_progress or {
-        "status": "unknown", "copied": 0, "skipped": 0, "failed": 0,
-        "deleted": 0, "total": 0, "last_run": ""
-    }
+            pass
 
+def _load_progress():
+    """Refresh _progress_cache if progress.json changed; a bad read keeps the last good copy.
 
-def pid_alive(pid: int) -> bool:
+    The exporter swaps the file in with os.replace(), so a read never sees half a write.
+    """
+    global _progress_cache
     try:
-        os.kill(pid, 0)
-        return True
+        st = os.stat(PROGRESS_FILE)
+        key = (st.st_mtime_ns, st.st_size)
+        if key == _progress_cache[0]:
+            return
+        with open(PROGRESS_FILE, "rb") as f:
+            raw = f.read()
+        data = _loads(raw)
+        # augmented once per file version; the cached dict is shared and never mutated after this
+        data.setdefault("export_dir", EXPORT_DIR)
+        _progress_cache = (key, raw, data)
     except Exception:
+        pass
+
+_PROGRESS_UNKNOWN = {
+    "status": "unknown", "copied": 0, "skipped": 0, "failed": 0,
+    "deleted": 0, "total": 0, "last_run": "", "export_dir": EXPORT_DIR,
+}
+
+def read_progress():
+    """Return progress from the cache, re-validating with one stat() unless inotify keeps it current"""
+    if not _progress_watched:
+        _load_progress()
+    # nothing readable yet: a neutral placeholder rather than an error
+    return _progress_cache[2] or _PROGRESS_UNKNOWN
+
+_IN_CLOSE_WRITE, _IN_MOVED_TO = 0x08, 0x80
+# the watch is gone (dir removed/remounted) or events were dropped
+_IN_Q_OVERFLOW, _IN_IGNORED = 0x4000, 0x8000
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then len bytes of name
+
+def _inotify_watch(path: str, mask: int):
+    """inotify fd watching path, or None where inotify isn't usable"""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+def _watch_progress(fd: int):
+    """Reload on progress.json events; once the watch can't be trusted, reads go back to stat()"""
+    global _progress_watched
+    name = os.path.basename(PROGRESS_FILE).encode()
+    try:
+        while True:
+            buf = os.read(fd, 64 * 1024)
+            pos, hit, lost = 0, False, False
+            while pos < len(buf):
+                _wd, mask, _cookie, length = _INOTIFY_EVENT.unpack_from(buf, pos)
+                pos += _INOTIFY_EVENT.size
+                hit = hit or buf[pos:pos + length].rstrip(b"\0") == name
+                lost = lost or bool(mask & (_IN_Q_OVERFLOW | _IN_IGNORED))
+                pos += length
+            if lost:
+                log("progress.json watch lost; checking the file on each request")
+                return
+            if hit:
+                _load_progress()
+                notify_change()
+    except Exception as e:
+        log(f"progress.json watch failed ({e}); checking the file on each request")
+    finally:
+        _progress_watched = False
+        os.close(fd)
+        notify_change()
+
+def start_progress_watch():
+    """Reload progress.json when the exporter replaces it, and wake /events streams at once.
+
+    Without inotify (or if EXPORT_DIR is missing) read_progress() keeps validating per call.
+    """
+    global _progress_watched
+    fd = _inotify_watch(EXPORT_DIR, _IN_CLOSE_WRITE | _IN_MOVED_TO)
+    if fd is None:
+        log("inotify unavailable; progress.json is checked on each request")
+        return
+    _load_progress()
+    _progress_watched = True
+    threading.Thread(target=_watch_progress, args=(fd,), daemon=True).start()
+
+
+def notify_change():
+    with _changed:
+        _changed.notify_all()
+
+def read_log_tail(n: int):
+    """(last n complete lines of RUN_LOG, byte offset just past them).
+
+    Reads backwards from EOF in 64 KiB steps, so cost tracks n, not the log size.
+    """
+    with open(RUN_LOG, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        while pos > 0 and buf.count(b"\n") <= n:
+            step = min(64 * 1024, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+    cut = buf.rfind(b"\n") + 1
+    lines = buf[:cut].decode(errors="replace").splitlines()[-n:]
+    return "\n".join(lines), pos + cut
+
+def read_log_since(offset: int):
+    """(complete lines appended to RUN_LOG after offset, new offset); None if the log shrank"""
+    with open(RUN_LOG, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        if offset > size:
+            return None
+        f.seek(offset)
+        chunk = f.read(size - offset)
+    end = chunk.rfind(b"\n") + 1  # whole lines only
+    return chunk[:end].decode(errors="replace"), offset + end
+
+def try_export_lock():
+    """fd holding LOCK_FILE's exclusive flock, or None while an export holds it.
+
+    The exporter inherits the fd, so the kernel drops the lock when it exits;
+    nothing can go stale.
+    """
+    with _flock_mutex:
+        fd = os.open(LOCK_FILE, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+def probe_export_lock() -> bool:
+    """True if an export holds LOCK_FILE's flock; ours is dropped before the mutex is"""
+    with _flock_mutex:
+        fd = os.open(LOCK_FILE, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)
         return False
 
+def own_export_alive():
+    """True/False for the exporter we started; None if we hold no pidfd (not ours, or no pidfd support)"""
+    with _export_lock:
+        fd = _export["pidfd"]
+        if fd is None:
+            return None
+        # a pidfd turns readable once the process exits
+        return not select.select([fd], [], [], 0)[0]
+
 def is_running() -> bool:
-    if not os.path.exists(LOCK_FILE):
-        return False
+    alive = own_export_alive()
+    if alive is not None:
+        return alive
     try:
-        with open(LOCK_FILE, "r") as f:
-            pid = int(f.read().strip())
-        return pid_alive(pid)
-    except Exception:
+        return probe_export_lock()
+    except OSError:
         return False
 
-def clear_stale_lock():
-    if not os.path.exists(LOCK_FILE):
-        return
-    try:
-        with open(LOCK_FILE, "r") as f:
-            pid = int(f.read().strip())
-        if not pid_alive(pid):
-            os.remove(LOCK_FILE)
-            log(f"Cleared stale lock (pid {pid}).")
-    except Exception:
-        try: os.remove(LOCK_FILE)
-        except Exception: pass
+def _write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
 
-def run_export_background():
+def run_export_background(lock_fd: int):
+    """Run the exporter, relaying its output; lock_fd comes from try_export_lock()"""
     env = os.environ.copy()
     log("Starting export subprocess…")
-    with open(RUN_LOG, "a") as lf:
-        lf.write("\n===== START EXPORT {} =====\n".format(time.strftime("%Y-%m-%d %H:%M:%S")))
-        lf.flush()
-
-    proc = subprocess.Popen(
-        ["python3", EXPORT_SCRIPT],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        env=env,
-        text=True,
-        bufsize=1
-    )
-
+    log_fd = None
     try:
-        with open(LOCK_FILE, "w") as f:
-            f.write(str(proc.pid))
+        log_fd = os.open(RUN_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)  # one fd for the whole run
+        _write_all(log_fd, "\n===== START EXPORT {} =====\n".format(time.strftime("%Y-%m-%d %H:%M:%S")).encode())
+        proc = subprocess.Popen(
+            ["python3", EXPORT_SCRIPT],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            bufsize=0,
+            pass_fds=(lock_fd,)  # the child's copy holds the flock until it exits
+        )
     except Exception as e:
+        log(f"Failed to start exporter: {e}")
+        if log_fd is not None:
+            os.close(log_fd)
+        os.close(lock_fd)
+        return
+
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        pidfd = None  # Python < 3.9 / Linux < 5.3: fall back to probing the flock
+    with _export_lock:
+        _export.update(pid=proc.pid, pidfd=pidfd)
+
+    try:
+        os.ftruncate(lock_fd, 0)
+        os.write(lock_fd, str(proc.pid).encode())  # informational only
+    except OSError as e:
         log(f"Failed to write lock file: {e}")
+    os.close(lock_fd)
 
+    # relay raw chunks as they arrive: no per-line decode or Python-level buffering
+    out_fd = proc.stdout.fileno()
     try:
-        with open(RUN_LOG, "a") as lf:
-            for line in proc.stdout:
-                lf.write(line); lf.flush()
-                print(line, end="", flush=True)
+        while True:
+            chunk = os.read(out_fd, 65536)
+            if not chunk:
+                break
+            _write_all(log_fd, chunk)
+            _write_all(1, chunk)
+            notify_change()
     except Exception as e:
         log(f"Error capturing exporter output: {e}")
+    finally:
+        os.close(log_fd)
+        proc.stdout.close()
 
     rc = proc.wait()
+    with _export_lock:
+        if _export["pid"] == proc.pid:  # a newer run may already have replaced it
+            _export.update(pid=None, pidfd=None)
+    if pidfd is not None:
+        os.close(pidfd)
     log(f"Export subprocess finished with rc={rc}")
-    try:
-        if os.path.exists(LOCK_FILE): os.remove(LOCK_FILE)
-    except Exception:
-        pass
+    notify_change()
 
-# --- routes ---
-@app.route("/")
-def index():
-    html = """<!doctype html>
+# --- page ---
+# Rendered once at import: nothing in it changes while the add-on runs
+_INDEX_HTML = """<!doctype html>
 <html>
 <head>
 <meta charset="utf-8"/>
@@ -382,38 +566,54 @@ const elements = {
 const BASE = location.pathname.replace(/\/$/, '');
 const apiUrl = (p) => `${BASE}/${p.replace(/^\//,'')}`;
 
+// Only touch DOM properties whose value changed
+function setText(el, v) { if (el.textContent !== v) el.textContent = v; }
+function setProp(el, key, v) { if (el['_' + key] !== v) { el['_' + key] = v; el[key] = v; } }
+
+let lastStatusJson = '';
+let pendingStatus = null;
+
+// Skip identical payloads and render at most once per animation frame
 function updateUI(status) {
+  const s = JSON.stringify(status);
+  if (s === lastStatusJson) return;
+  lastStatusJson = s;
+  if (pendingStatus === null) requestAnimationFrame(() => { renderStatus(pendingStatus); pendingStatus = null; });
+  pendingStatus = status;
+}
+
+function renderStatus(status) {
   const p = status.progress || {};
   const running = status.running;
-  elements.runBtn.disabled = running;
-  elements.runBtn.innerHTML = running ? 
+  setProp(elements.runBtn, 'disabled', running);
+  setProp(elements.runBtn, 'innerHTML', running ? 
     '<span class="icon">⏸️</span> Running...' : 
-    '<span class="icon">▶️</span> Run Export';
+    '<span class="icon">▶️</span> Run Export');
 
   let statusClass = 'status-complete';
   let statusText = p.status || 'unknown';
   if (running) { statusClass = 'status-running'; statusText = 'Running'; }
   else if (p.status === 'failed') { statusClass = 'status-failed'; statusText = 'Failed'; }
-  elements.statusBadge.className = 'status-badge ' + statusClass;
-  elements.statusBadge.textContent = 'Status: ' + statusText;
+  setProp(elements.statusBadge, 'className', 'status-badge ' + statusClass);
+  setText(elements.statusBadge, 'Status: ' + statusText);
 
   const total = p.total || 0;
   const processed = (p.copied || 0) + (p.skipped || 0) + (p.failed || 0);
   const percentage = total > 0 ? Math.round((processed / total) * 100) : 0;
-  elements.progressBar.style.width = percentage + '%';
-  elements.progressText.textContent =
-    percentage + '% Complete (' + processed.toLocaleString() + ' of ' + total.toLocaleString() + ' files)';
-
-  elements.copied.textContent = (p.copied || 0).toLocaleString();
-  elements.skipped.textContent = (p.skipped || 0).toLocaleString();
-  elements.failed.textContent = (p.failed || 0).toLocaleString();
-  elements.deleted.textContent = (p.deleted || 0).toLocaleString();
-
-  elements.lastRun.textContent = p.last_run || 'Never';
-  elements.running.textContent = running ? 'Yes' : 'No';
-  elements.guard.textContent = p.guard || '—';
-  elements.error.textContent = p.error || '—';
-  elements.rawData.textContent = JSON.stringify(p, null, 2);
+  setProp(elements.progressBar.style, 'width', percentage + '%');
+  setText(elements.progressText,
+    percentage + '% Complete (' + processed.toLocaleString() + ' of ' + total.toLocaleString() + ' files)');
+
+  setText(elements.copied, (p.copied || 0).toLocaleString());
+  setText(elements.skipped, (p.skipped || 0).toLocaleString());
+  setText(elements.failed, (p.failed || 0).toLocaleString());
+  setText(elements.deleted, (p.deleted || 0).toLocaleString());
+
+  setText(elements.lastRun, p.last_run || 'Never');
+  setText(elements.running, running ? 'Yes' : 'No');
+  setText(elements.guard, p.guard || '—');
+  setText(elements.error, p.error || '—');
+  setText(elements.rawData, JSON.stringify(p, null, 2));
 }
 
 async function apiCall(path, options) {
@@ -430,16 +630,23 @@ async function apiCall(path, options) {
   }
 }
 
+// With EventSource the log arrives over /events; polling gets status and new log bytes from /state
+let useEvents = !!window.EventSource;
+let logOffset = null;
+
 async function refreshData() {
   try {
-    const [status, logResponse] = await Promise.all([
-      apiCall('status'),
-      fetch(apiUrl('log?tail=200'))
-    ]);
-    updateUI(status);
-    const logText = await logResponse.text();
-    elements.logContainer.textContent = logText;
-    elements.logContainer.scrollTop = elements.logContainer.scrollHeight;
+    if (useEvents) {
+      const status = await apiCall('status');
+      if (status.progress) updateUI(status);
+      return;
+    }
+    const state = await apiCall(logOffset === null ? 'state' : 'state?since=' + logOffset);
+    if (state.status) updateUI(state.status);
+    if (state.log) {
+      showLog(state.log.text, state.log.append);
+      logOffset = state.log.offset;
+    }
   } catch (error) {
     console.error('Refresh failed:', error);
   }
@@ -454,64 +661,286 @@ elements.runBtn.onclick = async () => {
   }
 };
 
-setInterval(refreshData, 3000);
-refreshData();
+const LOG_MAX_CHARS = 200000;
+function showLog(text, append) {
+  const c = elements.logContainer;
+  let t = append ? c.textContent + text : text;
+  if (t.length > LOG_MAX_CHARS) t = t.slice(t.indexOf('\\n', t.length - LOG_MAX_CHARS) + 1);
+  c.textContent = t;
+  c.scrollTop = c.scrollHeight;
+}
+
+function startPolling() {
+  useEvents = false;
+  setInterval(refreshData, 3000);
+  refreshData();
+}
+
+// Server pushes status/log changes; poll without EventSource or when the server turns the stream away
+if (useEvents) {
+  const events = new EventSource(apiUrl('events'));
+  events.onmessage = (ev) => {
+    const d = JSON.parse(ev.data);
+    if (d.status) updateUI(d.status);
+    if (d.log !== undefined) showLog(d.log, false);
+    if (d.log_append !== undefined) showLog(d.log_append, true);
+  };
+  // an error response (503 when too many streams are open) closes it for good
+  events.onerror = () => { if (events.readyState === EventSource.CLOSED) startPolling(); };
+  refreshData();
+} else {
+  startPolling();
+}
 </script>
 
 </body>
 </html>"""
-    return Response(html, mimetype="text/html")
+_INDEX_BYTES = _INDEX_HTML.encode("utf-8")
+_INDEX_ETAG = hashlib.md5(_INDEX_BYTES).hexdigest()
+_INDEX_GZIP = gzip.compress(_INDEX_BYTES, 9)
+_INDEX_GZIP_ETAG = _INDEX_ETAG + "-gzip"
+
+# Text responses worth compressing; SSE streams and send_file bodies are left alone
+COMPRESS_MIMETYPES = {"text/html", "text/plain", "application/json"}
+COMPRESS_MIN_SIZE = 512
+
+def accepts_gzip() -> bool:
+    return "gzip" in request.accept_encodings
+
+@app.after_request
+def compress_response(resp):
+    if (resp.status_code != 200 or resp.is_streamed or resp.direct_passthrough
+            or resp.mimetype not in COMPRESS_MIMETYPES or "Content-Encoding" in resp.headers):
+        return resp
+    resp.vary.add("Accept-Encoding")
+    body = resp.get_data()
+    if len(body) < COMPRESS_MIN_SIZE or not accepts_gzip():
+        return resp
+    resp.set_data(gzip.compress(body, 6))
+    resp.headers["Content-Encoding"] = "gzip"
+    return resp
+
+# --- routes ---
+@app.route("/")
+def index():
+    # the page is compressed once at import rather than per request
+    gz = accepts_gzip()
+    etag = _INDEX_GZIP_ETAG if gz else _INDEX_ETAG
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(_INDEX_GZIP if gz else _INDEX_BYTES, mimetype="text/html")
+        if gz:
+            resp.headers["Content-Encoding"] = "gzip"
+    resp.set_etag(etag)
+    resp.vary.add("Accept-Encoding")
+    resp.headers["Cache-Control"] = "no-cache"  # revalidate so add-on updates show up at once
+    return resp
+
+def status_payload(running: bool):
+    return {
+        "running": running,
+        "progress": read_progress(),
+        "lock_file": running,  # the lock file persists; what matters is whether it's held
+        "run_log": RUN_LOG,
+    }
+
+def status_etag(running: bool) -> str:
+    """Changes whenever status_payload() would: cached progress version plus the lock state"""
+    if not _progress_watched:
+        _load_progress()
+    key = _progress_cache[0]
+    version = f"{key[0]}-{key[1]}" if key else "none"
+    return f"{version}-{int(running)}"
+
+# (etag, JSON bytes) of the last status built; shared by every /status and /events client
+_status_cache = (None, b"")
+
+def status_snapshot():
+    """Current (etag, status JSON); serialised once per change, however many tabs are open"""
+    global _status_cache
+    running = is_running()  # once, so the body can't disagree with the ETag it's cached under
+    etag = status_etag(running)
+    cached = _status_cache
+    if cached[0] != etag:
+        cached = _status_cache = (etag, _dumps(status_payload(running)))
+    return cached
 
 @app.route("/status")
 def status():
-    clear_stale_lock()
-    p = read_progress()
-    try: p.setdefault("export_dir", EXPORT_DIR)
-    except Exception: pass
-    return jsonify({
-        "running": is_running(),
-        "progress": p,
-        "lock_file": os.path.exists(LOCK_FILE),
-        "run_log": RUN_LOG,
-    })
+    # unchanged polls get a 304 without reading or serialising progress
+    etag, body = status_snapshot()
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(body, mimetype="application/json")
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+# Each open /events stream holds a server thread for its lifetime; past the cap
+# clients get a 503 and poll /state instead, leaving threads for everything else
+MAX_EVENT_STREAMS = 8
+# Streams end after this long and EventSource reconnects, so dead connections can't pile up
+EVENT_STREAM_MAX_SEC = 300
+_event_slots = threading.BoundedSemaphore(MAX_EVENT_STREAMS)
+
+@app.route("/events")
+def events():
+    """Server-Sent Events: status when progress.json or the running flag changes, log as it grows"""
+    if not _event_slots.acquire(blocking=False):
+        return Response("too many event streams", status=503, mimetype="text/plain")
+
+    def stream():
+        last_etag = None
+        offset = None
+        last_sent = time.monotonic()
+        deadline = last_sent + EVENT_STREAM_MAX_SEC
+        while time.monotonic() < deadline:
+            out = []
+            etag, body = status_snapshot()
+            if etag != last_etag:
+                last_etag = etag
+                out.append(b'data: {"status":' + body + b'}\n\n')
+            payload = {}
+            try:
+                size = os.path.getsize(RUN_LOG)
+            except OSError:
+                size = 0
+            if offset is None or size < offset:
+                # first message, or the log was truncated: send a fresh tail
+                try:
+                    text, offset = read_log_tail(200)
+                except FileNotFoundError:
+                    text, offset = "(no run log yet)", 0
+                payload["log"] = text + "\n" if text else text
+            elif size > offset:
+                appended = read_log_since(offset)
+                if appended is None:
+                    offset = None  # truncated meanwhile; re-tail next round
+                else:
+                    text, offset = appended
+                    if text:
+                        payload["log_append"] = text
+            if payload:
+                out.append(b"data: " + _dumps(payload) + b"\n\n")
+            if out:
+                last_sent = time.monotonic()
+                yield b"".join(out)
+            elif time.monotonic() - last_sent >= 15:
+                last_sent = time.monotonic()
+                yield b": ping\n\n"  # notices closed clients; keeps proxies from timing out
+            with _changed:
+                _changed.wait(timeout=1.0)
+
+    resp = Response(stream(), mimetype="text/event-stream")
+    resp.call_on_close(_event_slots.release)  # runs whether or not the stream was ever iterated
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+# /run-now only ever answers one of two bodies
+_RUN_OK = _dumps({"ok": True, "started": True})
+_RUN_BUSY = _dumps({"ok": False, "reason": "already_running"})
 
 @app.route("/run-now", methods=["POST","GET"])
 def run_now():
-    clear_stale_lock()
-    if is_running():
-        return Response(json.dumps({"ok":False,"reason":"already_running"},separators=(",",":")),
-                        mimetype="application/json")
-    t = threading.Thread(target=run_export_background, daemon=True)
+    lock_fd = try_export_lock()
+    if lock_fd is None:
+        return Response(_RUN_BUSY, status=409, mimetype="application/json")
+    t = threading.Thread(target=run_export_background, args=(lock_fd,), daemon=True)
     t.start()
     log("Manual run requested from UI.")
-    return Response(json.dumps({"ok":True,"started":True},separators=(",",":")),
-                    mimetype="application/json")
+    return Response(_RUN_OK, mimetype="application/json")
 
 # optional alias to handle trailing slash
 @app.route("/run-now/", methods=["POST","GET"])
 def run_now_slash():
     return run_now()
 
+def log_update(since, n=200):
+    """{"text", "offset", "append"}: lines added after since, else a fresh tail of n lines.
+
+    offset is what to pass as since= next time; None while there is no log yet.
+    """
+    try:
+        if since is not None:
+            appended = read_log_since(since)
+            if appended is not None:
+                text, offset = appended
+                return {"text": text, "offset": offset, "append": True}
+        text, offset = read_log_tail(n)
+        return {"text": text + "\n" if text else text, "offset": offset, "append": False}
+    except FileNotFoundError:
+        return {"text": "(no run log yet)", "offset": None, "append": False}
+
+@app.route("/state")
+def state():
+    """Status and the log delta in one round trip for polling clients (?since=OFFSET, ?tail=N)"""
+    n = request.args.get("tail", 200, type=int)
+    since = request.args.get("since", type=int)
+    _etag, body = status_snapshot()
+    resp = Response(b'{"status":' + body + b',"log":' + _dumps(log_update(since, n)) + b"}",
+                    mimetype="application/json")
+    resp.headers["Cache-Control"] = "no-store"
+    return resp
+
 @app.route("/log")
 def log_tail():
+    """?tail=N: last N lines. ?since=OFFSET: only lines added after OFFSET.
+
+    X-Log-Offset carries the offset to pass as since= next time; X-Log-Reset
+    marks a tail sent because since= pointed past the end of a truncated log.
+    """
     n = 200
     try:
         n = int(request.args.get("tail","200"))
     except Exception:
         pass
+    since = request.args.get("since", type=int)
     try:
-        with open(RUN_LOG, "rb") as f:
-            data = f.read()
-        lines = data.decode(errors="replace").splitlines()[-n:]
-        return Response("\n".join(lines), mimetype="text/plain")
+        if since is not None:
+            appended = read_log_since(since)
+            if appended is not None:
+                text, offset = appended
+                return Response(text, mimetype="text/plain",
+                                headers={"X-Log-Offset": str(offset), "Cache-Control": "no-store"})
+        st = os.stat(RUN_LOG)
+        etag = f"{st.st_mtime_ns}-{st.st_size}-{n}"
+        if request.if_none_match.contains_weak(etag):
+            resp = Response(status=304)
+        else:
+            text, offset = read_log_tail(n)
+            resp = Response(text + "\n" if text else text, mimetype="text/plain")
+            resp.headers["X-Log-Offset"] = str(offset)
     except FileNotFoundError:
         return Response("(no run log yet)", mimetype="text/plain")
+    if since is not None:
+        resp.headers["X-Log-Reset"] = "1"
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 @app.route("/progress")
 def progress_json():
-    return jsonify(read_progress())
+    # Serve the exporter's JSON as-is; unchanged polls get a 304 via Last-Modified/ETag
+    try:
+        st = os.stat(PROGRESS_FILE)
+        resp = send_file(PROGRESS_FILE, mimetype="application/json",
+                         last_modified=st.st_mtime, conditional=True)
+    except FileNotFoundError:
+        return json_response(read_progress())
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
 
 if __name__ == "__main__":
     log("Enhanced Web GUI starting on 0.0.0.0:5000")
-    app.run(host="0.0.0.0", port=5000, debug=False)
+    start_progress_watch()
+    try:
+        from waitress import serve
+    except ImportError:  # dev server fallback
+        app.run(host="0.0.0.0", port=5000, debug=False, threaded=True)
+    else:
+        # at most MAX_EVENT_STREAMS threads go to /events; the rest serve requests
+        serve(app, host="0.0.0.0", port=5000, threads=MAX_EVENT_STREAMS + 8)
 